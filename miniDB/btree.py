@@ -93,6 +93,77 @@ class Btree:
         self.nodes = [] # list of nodes. Every new node is appended here
         self.root = None # the index of the root node
 
+    @classmethod
+    def bulk_load(cls, pairs, b=3):
+        '''
+        Build a btree from already-sorted (value, ptr) pairs bottom-up: pack the pairs
+        into leaves at ~75% fill, link the leaf siblings, then build each internal level
+        from the one below it until a single root remains. This creates every node
+        exactly once, instead of the repeated node splits of per-value insertion.
+
+        Args:
+            pairs: list. (value, ptr) tuples, sorted ascending by value.
+            b: float. The branching factor of the built tree.
+        '''
+        tree = cls(b)
+        if not pairs:
+            return tree
+        fill = max(1, -(-(b-1)*3//4)) # ceil(0.75*(b-1)) values per node
+
+        # pack the pairs into leaves and link the siblings
+        leaf_ids = []
+        for start in range(0, len(pairs), fill):
+            chunk = pairs[start:start+fill]
+            tree.nodes.append(Node(b, [value for value, _ in chunk], [ptr for _, ptr in chunk], is_leaf=True))
+            leaf_ids.append(len(tree.nodes)-1)
+        for left_id, right_id in zip(leaf_ids, leaf_ids[1:]):
+            tree.nodes[left_id].right_sibling = right_id
+            tree.nodes[right_id].left_sibling = left_id
+
+        # build internal levels bottom-up until one node (the root) covers everything
+        level = leaf_ids
+        while len(level) > 1:
+            # group the level into fill+1 children per parent, stealing one child from
+            # the last full group if needed so that no parent is left with a single child
+            sizes = []
+            remaining = len(level)
+            while remaining:
+                take = min(fill+1, remaining)
+                if remaining-take == 1:
+                    take -= 1
+                sizes.append(take)
+                remaining -= take
+
+            next_level, start = [], 0
+            for size in sizes:
+                children = level[start:start+size]
+                start += size
+                # the separator for each child (except the first) is the smallest value
+                # of its subtree, so Node.find sends value<separator left of it
+                separators = [tree._min_value(child) for child in children[1:]]
+                tree.nodes.append(Node(b, separators, children, is_leaf=False))
+                node_id = len(tree.nodes)-1
+                for child in children:
+                    tree.nodes[child].parent = node_id
+                next_level.append(node_id)
+            level = next_level
+
+        tree.root = level[0]
+        return tree
+
+    def _min_value(self, node_id):
+        '''
+        Return the smallest value stored under the node with index=node_id
+        (follow the leftmost ptrs down to a leaf).
+
+        Args:
+            node_id: float. The corresponding ID of the node.
+        '''
+        node = self.nodes[node_id]
+        while not node.is_leaf:
+            node = self.nodes[node.ptrs[0]]
+        return node.values[0]
+
     def insert(self, value, ptr, rptr=None):
         '''
         Insert the value and its ptr/s to the appropriate node (node-level insertion is covered by the node object).
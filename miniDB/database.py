@@ -1,5 +1,9 @@
 from __future__ import annotations
+import csv
 import pickle
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pprint import pprint
 from time import sleep, localtime, strftime
 import os,sys
@@ -15,11 +19,20 @@ sys.modules['table'] = table
 from joins import Inlj, Smj
 from btree import Btree
 from extendible_hashing import ExtendibleHashing
+from hyperloglog import HyperLogLog
 from table import Table
 
 
 # readline.clear_history()
 
+IMPORT_BATCH_ROWS = 10000 # number of CSV rows inserted per _insert_many call in import_table.
+
+_CAST_TYPES = {'int': int, 'float': float, 'str': str, 'bool': bool} # types supported by the cast statement.
+
+INDEX_CACHE_SIZE = 64 # maximum number of index objects kept unpickled in memory.
+
+HLL_MIN_ROWS = 50000 # columns with at least this many rows get their distinct count estimated with a HyperLogLog sketch.
+
 class Database:
     '''
     Main Database class, containing tables.
@@ -31,69 +44,164 @@ class Database:
         self.verbose = verbose
         self.stats = {} # dictionary of statistics for each table.
         self.savedir = f'dbdata/{name}_db'
+        self._dirty = set() # names of tables mutated since the last save_database call.
+        self._stats_dirty = set() # user tables whose statistics entry is stale.
+        self._user_table_names = [] # names of the non-meta tables, in creation order.
+        self._loaded = False # set once the tables have been read from disk (or freshly created).
+        self._index_meta_cache = None # per-table view of meta_indexes, rebuilt lazily after DDL.
+        self._index_cache = OrderedDict() # LRU of loaded index objects, keyed by index name.
+        self._suppress_stats = False # set by _bulk()/batch() to defer statistics refreshes during bulk ops.
+        self._in_batch = False # set by batch() to defer save_database calls until the block exits.
+        self._pid = os.getpid() # cached once; the pid cannot change within the process.
+        self._locks_stamp = None # (mtime_ns, size) of meta_locks.pkl at the last (re)load.
+
+        # create the db's save directories (dbdata itself, the stats and the indexes
+        # dir) up front; exist_ok keeps re-opens cheap while real errors (e.g.
+        # permissions) still surface instead of being swallowed per save.
+        os.makedirs(f'{self.savedir}/stats_dir', exist_ok=True)
+        os.makedirs(f'{self.savedir}/indexes', exist_ok=True)
 
         if load:
-            try:
+            # check explicitly that a saved database is there (the meta tables are
+            # always written, so meta_length.pkl is a reliable marker) instead of
+            # attempting the load and swallowing whatever exception comes out.
+            if os.path.isfile(f'{self.savedir}/meta_length.pkl'):
                 self.load_database()
-                self.load_statistics()
+                if os.path.isfile(f'{self.savedir}/stats_dir/stats.pkl'):
+                    self.load_statistics()
                 self.calculate_tables_statistics() # update statistics.
                 logging.info(f'Loaded "{name}".')
                 return
-            except:
-                if verbose:
-                    warnings.warn(f'Database "{name}" does not exist. Creating new.')
-
-        # create dbdata directory if it doesn't exist
-        if not os.path.exists('dbdata'):
-            os.mkdir('dbdata')
-
-        # create new dbs save directory
-        try:
-            os.mkdir(self.savedir)
-            os.mkdir(f'{self.savedir}/stats_dir') # create stats directory.
-        except:
-            pass
+            if verbose:
+                warnings.warn(f'Database "{name}" does not exist. Creating new.')
 
         # create all the meta tables
-        self.create_table('meta_length', 'table_name,no_of_rows', 'str,int')
-        self.create_table('meta_locks', 'table_name,pid,mode', 'str,int,str')
-        self.create_table('meta_insert_stack', 'table_name,indexes', 'str,list')
-        self.create_table('meta_indexes', 'table_name,indexed_column,index_name,index_type', 'str,str,str,str')
+        self.create_table('meta_length', ['table_name', 'no_of_rows'], ['str', 'int'])
+        self.create_table('meta_locks', ['table_name', 'pid', 'mode'], ['str', 'int', 'str'])
+        self.create_table('meta_insert_stack', ['table_name', 'indexes'], ['str', 'list'])
+        self.create_table('meta_indexes', ['table_name', 'indexed_column', 'index_name', 'index_type'], ['str', 'str', 'str', 'str'])
         self.save_database()
+        self._loaded = True
 
-    def save_database(self):
+    def save_database(self, only=None):
         '''
         Save database as a pkl file. This method saves the database object, including all tables and attributes.
+
+        Args:
+            <> only: iterable. Names of the tables to save. If None, only the tables marked as
+               dirty since the last save are written (all tables if nothing is marked).
+        '''
+        if self._in_batch: # a batch() block writes everything once on exit
+            return
+        if only is None:
+            only = self._dirty if self._dirty else self.tables.keys()
+        for name in list(only):
+            if name not in self.tables: # e.g. dropped after being marked dirty
+                continue
+            path = f'{self.savedir}/{name}.pkl'
+            # write to a temp file and swap it in atomically, so a crash mid-write
+            # cannot corrupt the previous copy of the table. The large buffer keeps
+            # the pickle stream in few write syscalls.
+            with open(f'{path}.tmp', 'wb', buffering=1<<20) as f:
+                pickle.dump(self.tables[name], f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f'{path}.tmp', path)
+        self._dirty.clear()
+
+    def _mark_table_dirty(self, table_name):
+        '''
+        Record that a table was mutated: it needs writing on the next save_database
+        call and, for user tables, its statistics entry is stale. The two sets are
+        separate because save_database clears the first while the statistics refresh
+        consumes the second.
+
+        Args:
+            <> table_name: string. Name of the mutated table.
         '''
-        for name, table in self.tables.items():
-            with open(f'{self.savedir}/{name}.pkl', 'wb') as f:
-                pickle.dump(table, f)
+        self._dirty.add(table_name)
+        if table_name in self.tables and not self.tables[table_name]._is_meta:
+            self._stats_dirty.add(table_name)
 
     def _save_locks(self):
         '''
         Stores the meta_locks table to file as meta_locks.pkl.
+
+        meta_locks is small and rewritten on every lock/unlock, so the table is pickled
+        into one bytes buffer and written with a single os.write, skipping the buffered
+        file object construction of the regular save path.
         '''
-        with open(f'{self.savedir}/meta_locks.pkl', 'wb') as f:
-            pickle.dump(self.tables['meta_locks'], f)
+        path = f'{self.savedir}/meta_locks.pkl'
+        buffer = pickle.dumps(self.tables['meta_locks'], protocol=pickle.HIGHEST_PROTOCOL)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, buffer)
+        finally:
+            os.close(fd)
+        # remember what we just wrote, so _reload_locks can skip re-reading our own write.
+        stamp = os.stat(path)
+        self._locks_stamp = (stamp.st_mtime_ns, stamp.st_size)
+
+    def _reload_locks(self):
+        '''
+        Re-read meta_locks from disk only if the file has changed since the last load.
+
+        meta_locks is the only table shared between processes, so the lock methods must
+        see other processes' writes. Comparing (mtime_ns, size) against the last load
+        detects those with a single stat call and skips the full unpickle when nothing
+        changed, which is the common case.
+        '''
+        path = f'{self.savedir}/meta_locks.pkl'
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._locks_stamp:
+            return
+        with open(path, 'rb') as f:
+            locks_table = pickle.load(f)
+        if '_is_meta' not in locks_table.__dict__: # tables saved before the attribute existed
+            locks_table._is_meta = True
+        self.tables.update({'meta_locks': locks_table})
+        self._locks_stamp = stamp
 
-    def load_database(self):
+    def load_database(self, force=False):
         '''
         Load all tables that are part of the database (indices noted here are loaded).
 
+        Once the tables are in memory this is a no-op; the in-memory state is authoritative,
+        so re-reading every pkl on each query would only waste I/O. Only meta_locks is shared
+        between processes and it is re-read where needed (lock_table/is_locked).
+
         Args:
-            <> path: string. Directory (path) of the database on the system.
+            <> force: boolean. If True, re-read the tables from disk even if already loaded.
         '''
+        if self._loaded and not force:
+            return
         path = f'dbdata/{self._name}_db'
-        for file in os.listdir(path):
+        files = [file for file in os.listdir(path) if file.endswith('.pkl')] # load only pkl files
 
-            if file[-3:]!='pkl': # if used to load only pkl files
-                continue
-            f = open(path+'/'+file, 'rb')
-            tmp_dict = pickle.load(f)
-            f.close()
+        def load_table(file):
             name = f'{file.split(".")[0]}'
-            self.tables.update({name: tmp_dict})
-            # setattr(self, name, self.tables[name])
+            with open(f'{path}/{file}', 'rb', buffering=1<<20) as f:
+                # hint the kernel that the pickle is read front to back, so it can
+                # prefetch aggressively on cold caches (no-op off Linux).
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                loaded_table = pickle.load(f)
+            if '_is_meta' not in loaded_table.__dict__: # tables saved before the attribute existed
+                loaded_table._is_meta = name.startswith('meta')
+            return name, loaded_table
+
+        # the table loads are independent and I/O-bound, so issue them in parallel.
+        if files:
+            with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+                for name, loaded_table in executor.map(load_table, files):
+                    self.tables.update({name: loaded_table})
+                    if not loaded_table._is_meta and name not in self._user_table_names:
+                        self._user_table_names.append(name)
+                    # setattr(self, name, self.tables[name])
+        # the persisted stats may predate DML from earlier sessions (nothing refreshes
+        # them on exit), so treat every loaded user table as stale: the first refresh
+        # after a load recomputes them all, later ones stay incremental.
+        self._stats_dirty.update(self._user_table_names)
+        self._loaded = True
 
     #### IO ####
 
@@ -104,27 +212,76 @@ class Database:
         self._update_meta_length()
         self._update_meta_insert_stack()
 
+    @contextmanager
+    def _bulk(self):
+        '''
+        Suppress the statistics refresh for the duration of a bulk operation and
+        recompute once on exit, instead of once per mutation.
+        '''
+        previous = self._suppress_stats # may be nested inside a batch() block
+        self._suppress_stats = True
+        try:
+            yield
+        finally:
+            self._suppress_stats = previous
+            self.calculate_tables_statistics()
+
+    @contextmanager
+    def batch(self):
+        '''
+        Coalesce the writes of many operations into a single save.
+
+        Inside the with block every save_database call becomes a no-op while the
+        dirty-table set keeps accumulating, and the statistics refresh is deferred;
+        on exit the mutated tables are written once and the statistics are recomputed
+        once. Intended for migration-style scripts that run many DDL/DML statements
+        back to back:
+
+            with db.batch():
+                db.create_index(...)
+                db.create_index(...)
+        '''
+        self._in_batch = True
+        self._suppress_stats = True
+        try:
+            yield self
+        finally:
+            self._in_batch = False
+            self._suppress_stats = False
+            self.save_database()
+            self.calculate_tables_statistics()
+
     def create_table(self, name, column_names, column_types, primary_key=None, unique_columns=None, load=None):
         '''
         This method create a new table. This table is saved and can be accessed via db_object.tables['table_name'] or db_object.table_name
 
         Args:
             <> name: string. Name of table.
-            <> column_names: list. Names of columns.
-            <> column_types: list. Types of columns.
+            <> column_names: list or comma-separated string. Names of columns.
+            <> column_types: list or comma-separated string. Types of columns.
             <> primary_key: string. The primary key (if it exists).
-            <> unique_columns: list. List of columns that are unique.
+            <> unique_columns: list or comma-separated string. List of columns that are unique.
             <> load: boolean. Defines table object parameters as the name of the table and the column names.
         '''
-        # print('here -> ', column_names.split(','))
-            
+        # the SQL front end hands the columns in as comma-joined strings; programmatic
+        # callers can pass lists directly and skip the split round trip.
+        if isinstance(column_names, str):
+            column_names = column_names.split(',')
+        if isinstance(column_types, str):
+            column_types = column_types.split(',')
+        if isinstance(unique_columns, str):
+            unique_columns = unique_columns.split(',')
+
         self.tables.update(
-            { name: Table(name=name, column_names=column_names.split(','),
-                         column_types=column_types.split(','),
+            { name: Table(name=name, column_names=column_names,
+                         column_types=column_types,
                          primary_key=primary_key,
-                         unique_columns=unique_columns.split(',') if unique_columns is not None else None,
+                         unique_columns=unique_columns,
                          load=load) }
             )
+        self._mark_table_dirty(name)
+        if not self.tables[name]._is_meta and name not in self._user_table_names:
+            self._user_table_names.append(name)
         
         # self._name = Table(name=name, column_names=column_names, column_types=column_types, load=load)
         # check that new dynamic var doesnt exist already
@@ -147,6 +304,11 @@ class Database:
         self.lock_table(table_name)
 
         self.tables.pop(table_name)
+        self._dirty.discard(table_name)
+        self._stats_dirty.discard(table_name)
+        if table_name in self._user_table_names:
+            self._user_table_names.remove(table_name)
+        self.stats.pop(table_name, None)
         if os.path.isfile(f'{self.savedir}/{table_name}.pkl'):
             os.remove(f'{self.savedir}/{table_name}.pkl')
             self.calculate_tables_statistics() # update statistics.
@@ -181,19 +343,26 @@ class Database:
             <> column_types: list. Types of columns. If not specified, all will be set to type str.
             <> primary_key: string. The primary key (if it exists).
         '''
-        file = open(filename, 'r')
-
-        first_line=True
-        for line in file.readlines():
-            if first_line:
-                colnames = line.strip('\n')
-                if column_types is None:
-                    column_types = ",".join(['str' for _ in colnames.split(',')])
-                self.create_table(name=table_name, column_names=colnames, column_types=column_types, primary_key=primary_key)
-                lock_ownership = self.lock_table(table_name, mode='x')
-                first_line = False
-                continue
-            self.tables[table_name]._insert(line.strip('\n').split(','))
+        with self._bulk(), open(filename, 'r', newline='') as file:
+            reader = csv.reader(file)
+
+            colnames = ','.join(next(reader))
+            if column_types is None:
+                column_types = ",".join(['str' for _ in colnames.split(',')])
+            self.create_table(name=table_name, column_names=colnames, column_types=column_types, primary_key=primary_key)
+            lock_ownership = self.lock_table(table_name, mode='x')
+
+            # accumulate rows and insert them in batches, so the per-row
+            # casting/constraint overhead of _insert is paid once per batch.
+            batch = []
+            for row in reader:
+                batch.append(row)
+                if len(batch) == IMPORT_BATCH_ROWS:
+                    self.tables[table_name]._insert_many(batch)
+                    batch = []
+            if batch:
+                self.tables[table_name]._insert_many(batch)
+            self._mark_table_dirty(table_name)
 
         if lock_ownership:
              self.unlock_table(table_name)
@@ -208,15 +377,17 @@ class Database:
             <> table_name: string. Name of table.
             <> filename: string. Output CSV filename.
         '''
-        res = ''
-        for row in [self.tables[table_name].column_names]+self.tables[table_name].data:
-            res+=str(row)[1:-1].replace('\'', '').replace('"','').replace(' ','')+'\n'
-
         if filename is None:
             filename = f'{table_name}.csv'
 
-        with open(filename, 'w') as file:
-           file.write(res)
+        table = self.tables[table_name]
+        with open(filename, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(table.column_names)
+            # skip the None-filled rows left behind by deletes; they hold no data.
+            # deleted rows are exactly [None]*no_of_columns (see _delete_where); a live
+            # row of falsy values (e.g. [0, '']) must still be exported.
+            writer.writerows(row for row in table.data if not all(value is None for value in row))
 
     def table_from_object(self, new_table):
         '''
@@ -226,7 +397,11 @@ class Database:
             <> new_table: string. Name of new table.
         '''
 
+        new_table._is_meta = new_table._name.startswith('meta') # the object may have been renamed (save_as)
         self.tables.update({new_table._name: new_table})
+        self._mark_table_dirty(new_table._name)
+        if not new_table._is_meta and new_table._name not in self._user_table_names:
+            self._user_table_names.append(new_table._name)
         if new_table._name not in self.__dir__():
             setattr(self, new_table._name, new_table)
         else:
@@ -256,9 +431,14 @@ class Database:
             <> cast_type: type. Cast type (do not encapsulate in quotes).
         '''
         self.load_database()
-        
+
+        # resolve the type from a static dispatch table instead of eval-ing user input.
+        if cast_type not in _CAST_TYPES:
+            raise Exception(f'Cast type "{cast_type}" is not supported. Supported types: {", ".join(_CAST_TYPES)}.')
+
         lock_ownership = self.lock_table(table_name, mode='x')
-        self.tables[table_name]._cast_column(column_name, eval(cast_type))
+        self.tables[table_name]._cast_column(column_name, _CAST_TYPES[cast_type])
+        self._mark_table_dirty(table_name)
         if lock_ownership:
             self.unlock_table(table_name)
         self._update()
@@ -287,6 +467,7 @@ class Database:
             if lock_ownership: # if we locked the table, we need to unlock it before raising the exception
                 self.unlock_table(table_name)
             raise e # abort and raise exception
+        self._mark_table_dirty(table_name)
         self._update_meta_insert_stack_for_tb(table_name, insert_stack[:-1])
 
         if lock_ownership:
@@ -310,6 +491,7 @@ class Database:
         
         lock_ownership = self.lock_table(table_name, mode='x')
         self.tables[table_name]._update_rows(set_value, set_column, condition)
+        self._mark_table_dirty(table_name)
         if lock_ownership:
             self.unlock_table(table_name)
         self._update()
@@ -328,13 +510,18 @@ class Database:
         
         lock_ownership = self.lock_table(table_name, mode='x')
         deleted = self.tables[table_name]._delete_where(condition)
+        self._mark_table_dirty(table_name)
+        if table_name == 'meta_indexes':
+            self._index_meta_cache = None
+            for table in self.tables.values(): # re-derived lazily by _has_index
+                table.__dict__.pop('_has_any_index', None)
         if lock_ownership:
             self.unlock_table(table_name)
-        self._update()
-        self.save_database()
-        # we need the save above to avoid loading the old database that still contains the deleted elements
-        if table_name[:4]!='meta':
+        # register the freed slots before the meta refresh, so one save covers both
+        # the deleted rows and the updated insert stack.
+        if not self.tables[table_name]._is_meta:
             self._add_to_insert_stack(table_name, deleted)
+        self._update()
         self.save_database()
 
     def select(self, columns, table_name, condition, distinct=None, order_by=None, limit=True, desc=None, save_as=None, return_object=True):
@@ -362,38 +549,21 @@ class Database:
             return
         
         # if table has an index and a condition is given.
-        if self._has_index(table_name) and condition is not None:
-            # Table object of 'meta_indexes' table which contains the indexes of the specified table.
-            table_indexes = self.select('*', 'meta_indexes', f'table_name={table_name}', return_object=True)
-            
-            # get the indexes name for the specified table.
-            index_name_list = table_indexes.column_by_name('index_name')
-            
-            # get the indexed columns name for the specified table.
-            indexed_column_list = table_indexes.column_by_name('indexed_column')
-            
-            # get the indexed column type (btree or hash) for the specified table. 
-            indexed_type_list = table_indexes.column_by_name('index_type')
-            
-            btree_list = []
-            hash_list = []
-            
-            # create a list of dictionaries with the indexed column name as key and the index object (btree or hash) as value.
-            for i in range(len(index_name_list)):
-                if indexed_type_list[i] == 'btree':
-                    btree_list.append( { indexed_column_list[i]: self._load_idx(index_name_list[i]) } )
-                else: # indexed_type_list[i] == 'hash'
-                    hash_list.append( { indexed_column_list[i]: self._load_idx(index_name_list[i]) } )
-            
-            # create a dictionary with the indexed column name as key and the value of the condition as value.
+        if condition is not None and self._has_index(table_name):
+            # build the dictionaries with the indexed column name as key and the index
+            # object (btree or hash) as value, straight from the cached index metadata.
             btree_dic=None
             hash_dic=None
             
-            if btree_list:
-                btree_dic = {k: v for d in btree_list for k, v in d.items()}
-            
-            if hash_list:
-                hash_dic = {k: v for d in hash_list for k, v in d.items()}
+            for indexed_column, index_name, index_type in self._table_index_entries(table_name):
+                if index_type == 'btree':
+                    if btree_dic is None:
+                        btree_dic = {}
+                    btree_dic[indexed_column] = self._load_idx(index_name)
+                else: # index_type == 'hash'
+                    if hash_dic is None:
+                        hash_dic = {}
+                    hash_dic[indexed_column] = self._load_idx(index_name)
             
             table = self.tables[table_name]._select_where(columns, condition, distinct, order_by, desc, limit, btree_dic, hash_dic)
         else:
@@ -433,6 +603,7 @@ class Database:
         
         lock_ownership = self.lock_table(table_name, mode='x')
         self.tables[table_name]._sort(column_name, asc=asc)
+        self._mark_table_dirty(table_name)
         if lock_ownership:
             self.unlock_table(table_name)
         self._update()
@@ -488,44 +659,31 @@ class Database:
             # Check if there is an index of either of the two tables available, as if there isn't we can't use inlj
             leftIndexExists = self._has_index(left_table._name)
             rightIndexExists = self._has_index(right_table._name)
-            column_exist_r = False
-            column_exist_l = False
             
             if not leftIndexExists and not rightIndexExists:
                 res = None
                 raise Exception('Index-nested-loop join cannot be executed. Use inner join instead.\n')
 
-            if rightIndexExists:
-                # Get the 'meta_indexes' table object, which contains the indexes of the right table.
-                table_indexes_r = self.select('*', 'meta_indexes', f'table_name={right_table._name}', return_object=True)
-                
-                # Check if the indexed column of the right table is the same as the condition column ('on' clause).
-                column_name = condition.split('=')[0]
-                column_exist_r = [right_table._name, column_name] in [[row[0], row[1]] for row in table_indexes_r.data]
+            # find an index on the condition column ('on' clause) via the cached index
+            # metadata; prefer the right table, as the original implementation did.
+            column_name = condition.split('=')[0]
+            index_name = None
+            index_side = None
 
-            if leftIndexExists:
-                # Get the 'meta_indexes' table object, which contains the indexes of the left table.
-                table_indexes_l = self.select('*', 'meta_indexes', f'table_name={left_table._name}', return_object=True)
-                
-                # Check if the indexed column of the left table is the same as the condition column ('on' clause).
-                column_name = condition.split('=')[0]
-                column_exist_l = [left_table._name, column_name] in [[row[0], row[1]] for row in table_indexes_l.data]
-
-            if column_exist_r:
-                # If the column exists in the right table, get the specific index name and use it to join the tables.
-                for row in table_indexes_r.data:
-                    if row[0]==right_table._name and row[1]==column_name:
-                        index_name = row[2] # Get the index name
+            if rightIndexExists:
+                for indexed_column, cached_index_name, _ in self._table_index_entries(right_table._name):
+                    if indexed_column == column_name:
+                        index_name, index_side = cached_index_name, 'right'
                         break
-                res = Inlj(condition, left_table, right_table, self._load_idx(index_name), 'right').join()
 
-            elif column_exist_l:
-            # If the column exists in the left table, get the specific index name and use it to join the tables.
-                for row in table_indexes_l.data:
-                    if row[0]==left_table._name and row[1]==column_name:
-                        index_name = row[2] # Get the index name
+            if index_name is None and leftIndexExists:
+                for indexed_column, cached_index_name, _ in self._table_index_entries(left_table._name):
+                    if indexed_column == column_name:
+                        index_name, index_side = cached_index_name, 'left'
                         break
-                res = Inlj(condition, left_table, right_table, self._load_idx(index_name), 'left').join()
+
+            if index_name is not None:
+                res = Inlj(condition, left_table, right_table, self._load_idx(index_name), index_side).join()
 
         elif mode=='sm':
             res = Smj(condition, left_table, right_table).join()
@@ -554,24 +712,20 @@ class Database:
         Args:
             <> table_name: string. Table name (must be part of database).
         '''
-        if table_name[:4]=='meta' or table_name not in self.tables.keys() or isinstance(table_name,Table):
+        if isinstance(table_name,Table) or table_name not in self.tables.keys() or self.tables[table_name]._is_meta:
             return
 
-        with open(f'{self.savedir}/meta_locks.pkl', 'rb') as f:
-            self.tables.update({'meta_locks': pickle.load(f)})
+        self._reload_locks()
 
-        try:
-            pid = self.tables['meta_locks']._select_where('pid',f'table_name={table_name}').data[0][0]
-            if pid!=os.getpid():
+        pid = self.tables['meta_locks']._first_column_lookup(table_name, 'pid')
+        if pid is not None:
+            if pid!=self._pid:
                 raise Exception(f'Table "{table_name}" is locked by process with pid={pid}')
             else:
                 return False
 
-        except IndexError:
-            pass
-
         if mode=='x':
-            self.tables['meta_locks']._insert([table_name, os.getpid(), mode])
+            self.tables['meta_locks']._insert([table_name, self._pid, mode])
         else:
             raise NotImplementedError
         self._save_locks()
@@ -589,13 +743,10 @@ class Database:
             raise Exception(f'Table "{table_name}" is not in database')
 
         if not force:
-            try:
-                # pid = self.select('*','meta_locks',  f'table_name={table_name}', return_object=True).data[0][1]
-                pid = self.tables['meta_locks']._select_where('pid',f'table_name={table_name}').data[0][0]
-                if pid!=os.getpid():
-                    raise Exception(f'Table "{table_name}" is locked by the process with pid={pid}')
-            except IndexError:
-                pass
+            # pid = self.select('*','meta_locks',  f'table_name={table_name}', return_object=True).data[0][1]
+            pid = self.tables['meta_locks']._first_column_lookup(table_name, 'pid')
+            if pid is not None and pid!=self._pid:
+                raise Exception(f'Table "{table_name}" is locked by the process with pid={pid}')
         self.tables['meta_locks']._delete_where(f'table_name={table_name}')
         self._save_locks()
         # print(f'Unlocking table "{table_name}"')
@@ -607,19 +758,15 @@ class Database:
         Args:
             <> table_name: string. Table name (must be part of database).
         '''
-        if isinstance(table_name,Table) or table_name[:4]=='meta':  # meta tables will never be locked (they are internal)
+        # meta tables will never be locked (they are internal); unknown tables cannot be locked either
+        if isinstance(table_name,Table) or table_name not in self.tables.keys() or self.tables[table_name]._is_meta:
             return False
 
-        with open(f'{self.savedir}/meta_locks.pkl', 'rb') as f:
-            self.tables.update({'meta_locks': pickle.load(f)})
-
-        try:
-            pid = self.tables['meta_locks']._select_where('pid',f'table_name={table_name}').data[0][0]
-            if pid!=os.getpid():
-                raise Exception(f'Table "{table_name}" is locked by the process with pid={pid}')
+        self._reload_locks()
 
-        except IndexError:
-            pass
+        pid = self.tables['meta_locks']._first_column_lookup(table_name, 'pid')
+        if pid is not None and pid!=self._pid:
+            raise Exception(f'Table "{table_name}" is locked by the process with pid={pid}')
         return False
 
 
@@ -633,39 +780,50 @@ class Database:
         '''
         Updates the meta_length table.
         '''
-        for table in self.tables.values():
-            if table._name[:4]=='meta': #skip meta tables
-                continue
-            if table._name not in self.tables['meta_length'].column_by_name('table_name'): # if new table, add record with 0 no. of rows
-                self.tables['meta_length']._insert([table._name, 0])
+        self._dirty.add('meta_length')
+        meta_length = self.tables['meta_length']
+        length_index = meta_length._name_index()
+        user_tables = [table for table in self.tables.values() if not table._is_meta]
+
+        # new tables get their record in one batched insert, instead of one _insert
+        # (and one name-index rebuild) per table.
+        missing = [[table._name, 0] for table in user_tables if table._name not in length_index]
+        if missing:
+            meta_length._insert_many(missing)
+            length_index = meta_length._name_index()
 
+        for table in user_tables:
             # the result needs to represent the rows that contain data. Since we use an insert_stack
-            # some rows are filled with Nones. We skip these rows.
-            non_none_rows = len([row for row in table.data if any(row)])
-            self.tables['meta_length']._update_rows(non_none_rows, 'no_of_rows', f'table_name={table._name}')
-            # self.update_row('meta_length', len(table.data), 'no_of_rows', 'table_name', '==', table._name)
+            # some rows are filled with Nones. The table keeps that count incrementally.
+            meta_length.data[length_index[table._name]][1] = table._live_row_count() # no_of_rows column
 
     def _update_meta_locks(self):
         '''
         Updates the meta_locks table.
         '''
+        locks_index = self.tables['meta_locks']._name_index()
         for table in self.tables.values():
-            if table._name[:4]=='meta': #skip meta tables
+            if table._is_meta: #skip meta tables
                 continue
-            if table._name not in self.tables['meta_locks'].column_by_name('table_name'):
+            if table._name not in locks_index:
 
                 self.tables['meta_locks']._insert([table._name, False])
+                locks_index = self.tables['meta_locks']._name_index()
                 # self.insert('meta_locks', [table._name, False])
 
     def _update_meta_insert_stack(self):
         '''
         Updates the meta_insert_stack table.
         '''
-        for table in self.tables.values():
-            if table._name[:4]=='meta': #skip meta tables
-                continue
-            if table._name not in self.tables['meta_insert_stack'].column_by_name('table_name'):
-                self.tables['meta_insert_stack']._insert([table._name, []])
+        if 'meta_insert_stack' not in self.tables: # still bootstrapping the meta tables
+            return
+        meta_insert_stack = self.tables['meta_insert_stack']
+        stack_index = meta_insert_stack._name_index()
+        missing = [[table._name, []] for table in self.tables.values()
+                   if not table._is_meta and table._name not in stack_index]
+        if missing: # batched, like _update_meta_length
+            meta_insert_stack._insert_many(missing)
+            self._dirty.add('meta_insert_stack')
 
     def _add_to_insert_stack(self, table_name, indexes):
         '''
@@ -685,7 +843,8 @@ class Database:
         Args:
             <> table_name: string. Table name (must be part of database).
         '''
-        return self.tables['meta_insert_stack']._select_where('*', f'table_name={table_name}').column_by_name('indexes')[0]
+        meta_insert_stack = self.tables['meta_insert_stack']
+        return meta_insert_stack.data[meta_insert_stack._name_index()[table_name]][1] # indexes column
         # res = self.select('meta_insert_stack', '*', f'table_name={table_name}', return_object=True).indexes[0]
         # return res
 
@@ -697,14 +856,18 @@ class Database:
             <> table_name: string. Table name (must be part of database).
             <> new_stack: string. The stack that will be used to replace the existing one.
         '''
-        self.tables['meta_insert_stack']._update_rows(new_stack, 'indexes', f'table_name={table_name}')
+        meta_insert_stack = self.tables['meta_insert_stack']
+        row_pos = meta_insert_stack._name_index().get(table_name)
+        if row_pos is not None:
+            meta_insert_stack.data[row_pos][1] = new_stack # indexes column
+        self._dirty.add('meta_insert_stack')
 
     def save_statistics(self):
         '''
         Save statistics to file.
         '''
         with open(f'{self.savedir}/stats_dir/stats.pkl', 'wb') as f:
-            pickle.dump(self.stats, f)
+            pickle.dump(self.stats, f, protocol=pickle.HIGHEST_PROTOCOL)
 
     def load_statistics(self):
         '''
@@ -724,26 +887,70 @@ class Database:
         '''
         if self.tables == {}: # if no tables in db.
             return # do nothing
+        if self._suppress_stats: # a bulk operation recomputes once at the end.
+            return
         
-        stats = {}
-        for table_name in self.tables:
-            if table_name.startswith('meta'):
-                continue
-            table = self.tables[table_name] # get table object
-            size = len(table.data) # number of rows
-            column_names = table.column_names # list of column names
-            columns = {}
-            for col_name in column_names:
-                distinct_values = [row for row in table.column_by_name(col_name)]
-                distinct_values = len(set(distinct_values))
-                columns[col_name] = {"distinct_values": distinct_values}
-            stats[table_name] = {
-                    "size": size,
-                    "columns": columns
-                }
+        # recompute only the tables mutated since their last refresh (tracked in
+        # _stats_dirty via _mark_table_dirty) plus any table without an entry yet;
+        # every other table keeps its cached entry. Meta tables keep no statistics,
+        # so the worklist comes from the maintained non-meta name list directly.
+        user_tables = self._user_table_names
+        if self.stats:
+            stats = {name: entry for name, entry in self.stats.items() if name in self.tables}
+            table_names = [name for name in user_tables if name in self._stats_dirty or name not in stats]
+            if not table_names and stats == self.stats:
+                return # nothing changed since the last refresh
+        else:
+            stats = {}
+            table_names = user_tables
+        if len(table_names) > 1:
+            # the per-table work is independent and mostly C-level hashing inside
+            # set()/blake2b, so fan it out across a thread pool.
+            with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, len(table_names))) as executor:
+                for table_name, table_stats in zip(table_names, executor.map(self._stats_for_table, (self.tables[name] for name in table_names))):
+                    stats[table_name] = table_stats
+        else:
+            for table_name in table_names:
+                stats[table_name] = self._stats_for_table(self.tables[table_name])
+        self._stats_dirty.difference_update(table_names)
         self.stats = stats
         self.save_statistics()
 
+    def _stats_for_table(self, table):
+        '''
+        Compute and return the statistics entry ({'size', 'columns'}) of one table.
+
+        Args:
+            <> table: Table. The table object to compute statistics for.
+        '''
+        size = len(table.data) # number of rows
+        column_names = table.column_names # list of column names
+        # pk/unique columns hold one distinct value per live row by constraint, so
+        # their count needs no scan at all; only the unconstrained columns are hashed.
+        constrained = table._index_candidate_columns()
+        live_rows = table._live_row_count() if constrained else 0
+        if size >= HLL_MIN_ROWS:
+            # estimate with constant-memory sketches instead of building a set of
+            # every value (~1.6% error, a few KB of registers per column). One
+            # row-major pass feeds all the sketches, so each row is touched once.
+            sketches = [None if col_name in constrained else HyperLogLog(p=12) for col_name in column_names]
+            for row in table.data:
+                for hll, value in zip(sketches, row):
+                    if hll is not None and value is not None:
+                        hll.update(value)
+            columns = {col_name: {"distinct_values": live_rows if hll is None else hll.count()}
+                       for col_name, hll in zip(column_names, sketches)}
+        else:
+            # one C-level transpose of the row-major data yields every column in
+            # a single pass over the table, instead of one scan per column.
+            column_values = zip(*table.data) if table.data else ([] for _ in column_names)
+            columns = {col_name: {"distinct_values": live_rows if col_name in constrained else len(set(column))}
+                       for col_name, column in zip(column_names, column_values)}
+        return {
+                "size": size,
+                "columns": columns
+            }
+
     def print_statistics(self):
         '''
         Print statistics for all the tables in the database.
@@ -778,28 +985,33 @@ class Database:
         if index_type not in ['btree', 'hash']:
             raise Exception(f'Index type "{index_type}" is not supported. Supported types: btree, hash.')
         
+        valid_columns = self.tables[table_name]._index_candidate_columns()
+
         # check if table has a primary key or a unique column.
-        if self.tables[table_name].pk_idx is None and self.tables[table_name].unique_columns is None:
+        if not valid_columns:
             raise Exception('Cannot create index. Table must have a primary key or a unique column.')
         
         # check if the specified column is a primary key or a unique column.
-        if column_name!=self.tables[table_name].pk and column_name not in self.tables[table_name].unique_columns:
+        if column_name not in valid_columns:
             raise Exception('Cannot create index. The specified column is not a primary key or a unique column.')
         
         # check if index name already exists.
-        if index_name in self.tables['meta_indexes'].column_by_name('index_name'):
+        if index_name in self._index_meta()[1]:
             raise Exception('Cannot create index. Another index with the same index name already exists.')
 
         # check if the column is already indexed for the specified table.
-        if [table_name, column_name] in [[row[0], row[1]] for row in self.tables['meta_indexes'].data]:
+        if (table_name, column_name) in self._index_meta()[2]:
             raise Exception('Cannot create index. The given column is already indexed for the specified table.')
         
         # add the index to meta_indexes
         logging.info(f'Creating {index_type} index.')
         self.tables['meta_indexes']._insert([table_name, column_name, index_name, index_type])
+        self._dirty.add('meta_indexes')
+        self._index_meta_cache = None
         
         # create the actual index
         self._construct_index(table_name, column_name, index_name, index_type)
+        self.tables[table_name]._has_any_index = True
         self.save_database()
 
     def _construct_index(self, table_name, column_name, index_name, index_type):
@@ -812,20 +1024,32 @@ class Database:
             <> index_name: string. Name of the created index.
             <> index_type: string. The type of the index. Supported types: btree, hash.
         '''
-        # create the index
+        # collect the (key, record index) pairs of column_name once, skipping deleted rows.
+        # the column offset is resolved once and the pairs are read straight out of the
+        # rows, instead of materializing an intermediate list through column_by_name.
+        table = self.tables[table_name]
+        column_idx = table.column_names.index(column_name)
+        pairs = [(row[column_idx], idx) for idx, row in enumerate(table.data) if row[column_idx] is not None]
+
         if index_type=='btree':
-            index = Btree(3) # 3 is arbitrary
+            # sort once and build the tree bottom-up, instead of N inserts with repeated
+            # node splits. The keys are unique (pk/unique column), so the plain tuple
+            # sort never falls through to the ptrs and needs no per-element key callable.
+            pairs.sort()
+            # the keys come from a pk/unique column, so duplicates should not occur;
+            # collapse any equal adjacent keys (keeping the first ptr) so a duplicated
+            # key can never become a duplicated separator inside the tree.
+            unique_pairs = []
+            previous_key = object() # sentinel no key can compare equal to
+            for pair in pairs:
+                if pair[0] != previous_key:
+                    unique_pairs.append(pair)
+                    previous_key = pair[0]
+            index = Btree.bulk_load(unique_pairs, 3) # 3 is arbitrary
         else: # index_type=='hash'
-            index = ExtendibleHashing(1, 4)
-          
-        # for each record of column_name, insert the key and the index of the record in the btree or hash (depending on the index type).
-        for idx, key in enumerate(self.tables[table_name].column_by_name(column_name)):
-            if key is None:
-                continue
-            if index_type=='btree':
-                index.insert(key, idx)
-            else: # index_type=='hash'
-                index._add(key, idx)
+            # the keys come from a pk/unique column, so len(pairs) is the exact
+            # cardinality and bulk_build can pre-size the directory from it.
+            index = ExtendibleHashing.bulk_build(pairs, 4)
         
         # save the index to the database.
         self._save_index(index_name, index)
@@ -840,9 +1064,50 @@ class Database:
             <> column_name: string. Column name (must be part of table). If None, check if the table has any index.
         '''
         if column_name is None: # check if the table has any index.
-            return table_name in self.tables['meta_indexes'].column_by_name('table_name')
+            # the answer is memoized on the table object itself, so the hot planner
+            # probe is one dict lookup; DDL on meta_indexes drops the memo.
+            table = self.tables.get(table_name) # drop_table asks after popping the table
+            if table is None:
+                return bool(self._table_index_entries(table_name))
+            flag = table.__dict__.get('_has_any_index')
+            if flag is None: # not derived yet (e.g. right after load or after DDL)
+                flag = bool(self._table_index_entries(table_name))
+                table._has_any_index = flag
+            return flag
         # else check if the specified column is indexed.
-        return [table_name, column_name] in [[row[0], row[1]] for row in self.tables['meta_indexes'].data]
+        return any(indexed_column == column_name for indexed_column, _, _ in self._table_index_entries(table_name))
+
+    def _index_meta(self):
+        '''
+        Build (lazily) and return the cached view of meta_indexes as a tuple of:
+        a per-table dict of (indexed_column, index_name, index_type) entries, the set
+        of all index names and the set of all (table_name, indexed_column) pairs.
+
+        The view is kept so that select/join, _has_index and the DDL uniqueness checks
+        are O(1) hash probes instead of re-scanning meta_indexes; it is invalidated
+        whenever meta_indexes is mutated (create_index, drop_index, delete_from).
+        '''
+        cache = self._index_meta_cache
+        if cache is None:
+            per_table, index_names, indexed_columns = {}, set(), set()
+            for row in self.tables['meta_indexes'].data:
+                if any(row):
+                    per_table.setdefault(row[0], []).append((row[1], row[2], row[3]))
+                    index_names.add(row[2])
+                    indexed_columns.add((row[0], row[1]))
+            cache = (per_table, index_names, indexed_columns)
+            self._index_meta_cache = cache
+        return cache
+
+    def _table_index_entries(self, table_name):
+        '''
+        Return the (indexed_column, index_name, index_type) entries of meta_indexes
+        for the specified table.
+
+        Args:
+            <> table_name: string. Table name (must be part of database).
+        '''
+        return self._index_meta()[0].get(table_name, [])
 
     def _save_index(self, index_name, index):
         '''
@@ -852,24 +1117,47 @@ class Database:
             <> index_name: string. Name of the created index.
             <> index: obj. The actual index object (btree object).
         '''
-        try:
-            os.mkdir(f'{self.savedir}/indexes')
-        except:
-            pass
+        # binary framed protocol and a large buffer: smaller file, fewer write syscalls.
+        # write to a temp file, fsync it and swap it in atomically, so a crash mid-write
+        # leaves the previous copy intact instead of forcing a full index rebuild.
+        path = f'{self.savedir}/indexes/meta_{index_name}_index.pkl'
+        with open(f'{path}.tmp', 'wb', buffering=1<<20) as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f'{path}.tmp', path)
+        if hasattr(os, 'O_DIRECTORY'): # persist the rename itself (no-op off POSIX).
+            dirfd = os.open(f'{self.savedir}/indexes', os.O_DIRECTORY)
+            try:
+                os.fsync(dirfd)
+            finally:
+                os.close(dirfd)
 
-        with open(f'{self.savedir}/indexes/meta_{index_name}_index.pkl', 'wb') as f:
-            pickle.dump(index, f)
+        # the freshly built object is what a reader would unpickle; cache it directly.
+        self._index_cache[index_name] = index
+        self._index_cache.move_to_end(index_name)
+        if len(self._index_cache) > INDEX_CACHE_SIZE:
+            self._index_cache.popitem(last=False)
 
     def _load_idx(self, index_name):
         '''
         Load and return the specified index.
 
+        The unpickled objects are kept in an LRU cache of INDEX_CACHE_SIZE entries,
+        so select/join pay the disk read and unpickle only on the first use of an
+        index; drop_index evicts its entry.
+
         Args:
             <> index_name: string. Name of created index.
         '''
-        f = open(f'{self.savedir}/indexes/meta_{index_name}_index.pkl', 'rb')
-        index = pickle.load(f)
-        f.close()
+        if index_name in self._index_cache:
+            self._index_cache.move_to_end(index_name)
+            return self._index_cache[index_name]
+        with open(f'{self.savedir}/indexes/meta_{index_name}_index.pkl', 'rb', buffering=1<<20) as f:
+            index = pickle.load(f)
+        self._index_cache[index_name] = index
+        if len(self._index_cache) > INDEX_CACHE_SIZE:
+            self._index_cache.popitem(last=False)
         return index
 
     def drop_index(self, index_name):
@@ -879,8 +1167,18 @@ class Database:
         Args:
             <> index_name: string. Name of index.
         '''
-        if index_name in self.tables['meta_indexes'].column_by_name('index_name'):
-            self.delete_from('meta_indexes', f'index_name = {index_name}')
+        if index_name in self._index_meta()[1]:
+            # the owning table's any-index memo must be re-derived after the removal.
+            owner = next((name for name, entries in self._index_meta()[0].items()
+                          if any(entry[1] == index_name for entry in entries)), None)
+            self._index_cache.pop(index_name, None)
+            # the exact row is known, so drop it directly instead of formatting a
+            # condition string for delete_from to re-parse and scan with.
+            self.tables['meta_indexes']._delete_where_eq('index_name', index_name)
+            self._dirty.add('meta_indexes')
+            self._index_meta_cache = None
+            if owner is not None and owner in self.tables:
+                self.tables[owner].__dict__.pop('_has_any_index', None)
 
             if os.path.isfile(f'{self.savedir}/indexes/meta_{index_name}_index.pkl'):
                 os.remove(f'{self.savedir}/indexes/meta_{index_name}_index.pkl')
@@ -17,6 +17,24 @@ class ExtendibleHashing:
         self.buckets = {i: [] for i in range(2 ** self.bits)} # initializing the bucket with 2 ** depth empty buckets.
         self.bucket_size = bucket_size # maximum number of records that can be stored in a bucket.
 
+    @classmethod
+    def bulk_build(cls, pairs, bucket_size=3):
+        '''
+        Builds a hash table from (key, value) pairs with the directory pre-sized to
+        about len(pairs) / bucket_size buckets, so filling it avoids most of the
+        directory doublings (each a full rehash) of growing from the default 2 buckets.
+
+        Args:
+            <> pairs: The list of (key, value) tuples to be added.
+            <> bucket_size: The maximum number of records that can be stored in a bucket.
+        '''
+        buckets_needed = max(1, (len(pairs) + bucket_size - 1) // bucket_size)
+        bits = max(1, (buckets_needed - 1).bit_length()) # ceil(log2(buckets_needed))
+        table = cls(bits, bucket_size)
+        for key, value in pairs:
+            table._add(key, value)
+        return table
+
     def _add(self, key, value):
         '''
         Adds a key-value pair to the hash table.
@@ -86,13 +104,12 @@ class ExtendibleHashing:
             <> bucket: The bucket to be split.
         '''
         self.bits += 1
-        temp_buckets = {i: [] for i in range(2 ** self.bits)}
-        for key in self.buckets.keys():
-            if key == lsb:
-                continue
-            temp_buckets[key] = self.buckets[key]
-        self.buckets = temp_buckets
-        for k, v in bucket:
+        # doubling the directory changes the modulus of _hash, so every stored pair
+        # must be rehashed; pairs left in their old bucket would become unreachable.
+        pairs = [pair for index, existing in self.buckets.items() if index != lsb for pair in existing]
+        pairs.extend(bucket)
+        self.buckets = {i: [] for i in range(2 ** self.bits)}
+        for k, v in pairs:
             self._add(k, v)
     
     def _print(self):
@@ -32,15 +32,24 @@ class Table:
             # if load is a dict, replace the object dict with it (replaces the object with the specified one)
             if isinstance(load, dict):
                 self.__dict__.update(load)
+                # a dict built from another table (e.g. a _select_where result) carries
+                # that table's cached bookkeeping; drop it so this table re-derives the
+                # caches lazily from its own rows, like a freshly unpickled one does.
+                for cache_attr in ('_live_rows', '_name_index_cache', '_has_any_index', '_valid_index_columns'):
+                    self.__dict__.pop(cache_attr, None)
+                self._is_meta = self._name.startswith('meta')
                 # self._update()
             # if load is str, load from a file
             elif isinstance(load, str):
                 self._load_from_file(load)
+            if '_is_meta' not in self.__dict__: # tables saved before the attribute existed
+                self._is_meta = self._name.startswith('meta')
 
         # if name, columns_names and column types are not none
         elif (name is not None) and (column_names is not None) and (column_types is not None):
 
             self._name = name
+            self._is_meta = name.startswith('meta') # cached; checked on every meta-table loop
 
             if len(column_names)!=len(column_types):
                 raise ValueError('Need same number of column names and types.')
@@ -81,6 +90,79 @@ class Table:
     def column_by_name(self, column_name):
         return [row[self.column_names.index(column_name)] for row in self.data]
 
+    def _name_index(self):
+        '''
+        Return a dict that maps each row's first-column value to its row position.
+
+        Used for the meta tables, whose first column (table_name) identifies the row:
+        it turns the linear column_by_name membership scans into O(1) dict lookups.
+        The dict is cached and invalidated whenever the table data is mutated.
+        '''
+        index = getattr(self, '_name_index_cache', None)
+        if index is None:
+            index = {row[0]: pos for pos, row in enumerate(self.data) if row[0] is not None}
+            self._name_index_cache = index
+        return index
+
+    def _live_row_count(self):
+        '''
+        Return the number of rows that actually hold data.
+
+        Deletes leave None-filled rows behind (see _delete_where), so len(self.data)
+        overcounts. The count is maintained incrementally by _insert/_insert_many/
+        _delete_where and rebuilt lazily when missing (e.g. tables unpickled from
+        older saves or mutated through _update_rows).
+        '''
+        count = getattr(self, '_live_rows', None)
+        if count is None:
+            count = sum(1 for row in self.data if any(row))
+            self._live_rows = count
+        return count
+
+    def _index_candidate_columns(self):
+        '''
+        Returns the set of columns an index may be built on (the primary key and the
+        unique columns). Built lazily and cached on the table, so repeated DDL checks
+        are a single set probe instead of re-chasing pk/unique_columns attributes
+        (the getattr keeps tables pickled before the cache existed working).
+        '''
+        cached = getattr(self, '_valid_index_columns', None)
+        if cached is None:
+            cached = set(self.unique_columns or [])
+            if self.pk is not None:
+                cached.add(self.pk)
+            self._valid_index_columns = cached
+        return cached
+
+    def _delete_where_eq(self, column_name, value):
+        '''
+        Deletes the rows where column_name equals value, without going through the
+        condition parser of _delete_where. The matching rows are dropped in a single
+        C-level pass (meta-table semantics: rows are removed, not replaced with Nones),
+        so this is only meant for the meta/bookkeeping tables.
+
+        Args:
+            <> column_name: string. Name of the column to match on.
+            <> value: The value the column must equal for the row to be deleted.
+        '''
+        column_idx = self.column_names.index(column_name)
+        self.data = [row for row in self.data if row[column_idx] != value]
+        self._name_index_cache = None
+        self.__dict__.pop('_live_rows', None)
+
+    def _first_column_lookup(self, key, column_name):
+        '''
+        Return the value of column_name in the row whose first column equals key,
+        or None if no such row exists.
+
+        Uses the cached _name_index dict, so the hot callers (the lock methods) skip
+        the condition parsing and result-table construction of _select_where.
+        '''
+        row_pos = self._name_index().get(key)
+        if row_pos is None:
+            return None
+        return self.data[row_pos][self.column_names.index(column_name)]
+
     def _update(self):
         '''
         Update all the available columns with the appended rows.
@@ -143,8 +225,67 @@ class Table:
             self.data[insert_stack[-1]] = row
         else: # else append to the end
             self.data.append(row)
+        self._name_index_cache = None
+        if '_live_rows' in self.__dict__: # inserts always land on a None-filled slot or append
+            self._live_rows += 1
         # self._update()
 
+    def _insert_many(self, rows):
+        '''
+        Insert multiple rows to the table at once.
+
+        The per-row work of _insert (type casting, primary key and unique checks) is done
+        with the column types resolved once and the existing constrained values collected
+        into sets up front, so bulk loads avoid the per-call overhead of repeated _insert
+        invocations. All rows are appended with a single extend.
+
+        Args:
+            <> rows: list. A list of rows (lists of values) to be inserted.
+        '''
+        column_types = self.column_types
+        no_of_columns = len(self.column_names)
+
+        # collect the existing values of the constrained columns once, for duplicate detection
+        pk_existing = set(self.column_by_name(self.pk)) if self.pk_idx is not None else None
+        unique_existing = {}
+        if self.unique_columns is not None:
+            unique_existing = {idx: set(self.column_by_name(self.column_names[idx])) for idx in self.unique_columns_idx}
+
+        casted_rows = []
+        for row in rows:
+            if len(row)!=no_of_columns:
+                raise ValueError(f'ERROR -> Cannot insert {len(row)} values. Only {no_of_columns} columns exist')
+
+            row = list(row)
+            for i in range(no_of_columns):
+                try:
+                    row[i] = column_types[i](row[i])
+                except ValueError:
+                    if row[i] != 'NULL':
+                        raise ValueError(f'ERROR -> Value {row[i]} of type {type(row[i])} is not of type {column_types[i]}.')
+                except TypeError as exc:
+                    if row[i] != None:
+                        print(exc)
+
+                if i==self.pk_idx:
+                    if row[i] is None or row[i] == '':
+                        raise ValueError(f'ERROR -> The value of the primary key cannot be None.')
+                    if row[i] in pk_existing:
+                        raise ValueError(f'ERROR -> Value "{row[i]}" already exists in primary key column.')
+                    pk_existing.add(row[i])
+
+                if i in unique_existing:
+                    if row[i] in unique_existing[i]:
+                        raise ValueError(f'ERROR -> Value "{row[i]}" already exists in unique column "{self.column_names[i]}".')
+                    unique_existing[i].add(row[i])
+
+            casted_rows.append(row)
+
+        self.data.extend(casted_rows)
+        self._name_index_cache = None
+        if '_live_rows' in self.__dict__:
+            self._live_rows += len(casted_rows)
+
     def _update_rows(self, set_value, set_column, condition):
         '''
         Update where Condition is met.
@@ -163,10 +304,15 @@ class Table:
         if condition is not None:
             indexes_to_upd = self.find_rows_by_condition(condition) # get the indexes of the rows to be updated
         else: # if condition is None, update all rows
-            indexes_to_upd = [i for i in range(len(self.data))] # get all indexes
+            indexes_to_upd = list(range(len(self.data))) # get all indexes
             
         for idx in indexes_to_upd:
             self.data[idx][set_column_idx] = set_value
+        if set_column_idx == 0:
+            self._name_index_cache = None
+        # an unconditional update can write into None-filled rows, so the cached
+        # live-row count can no longer be trusted; recount lazily when next needed.
+        self.__dict__.pop('_live_rows', None)
 
         # self._update()
                 # print(f"Updated {len(indexes_to_del)} rows")
@@ -185,18 +331,25 @@ class Table:
         if condition is not None:
             indexes_to_del = self.find_rows_by_condition(condition) # get the indexes of the rows to be deleted
         else: # if condition is None, delete all rows
-            indexes_to_del = [i for i in range(len(self.data))] # get all indexes
+            indexes_to_del = list(range(len(self.data))) # get all indexes
                 
+        # count how many of the deleted rows actually held data, to keep the
+        # incremental live-row count accurate (a delete-all also hits None rows).
+        live_deleted = sum(1 for index in indexes_to_del if any(self.data[index]))
+
         # we pop from highest to lowest index in order to avoid removing the wrong item
         # since we dont delete, we dont have to pop in that order, but since delete is used
         # to delete from meta tables too, we still implement it.
 
         for index in sorted(indexes_to_del, reverse=True):
-            if self._name[:4] != 'meta':
+            if not self._is_meta:
                 # if the table is not a metatable, replace the row with a row of nones
                 self.data[index] = [None for _ in range(len(self.column_names))]
             else:
                 self.data.pop(index)
+        self._name_index_cache = None
+        if '_live_rows' in self.__dict__:
+            self._live_rows -= live_deleted
 
         # self._update()
         # we have to return the deleted indexes, since they will be appended to the insert_stack
@@ -220,7 +373,7 @@ class Table:
 
         # if * return all columns, else find the column indexes for the columns specified
         if return_columns == '*':
-            return_cols = [i for i in range(len(self.column_names))]
+            return_cols = list(range(len(self.column_names)))
         else:
             return_cols = [self.column_names.index(col.strip()) for col in return_columns.split(',')]
 
@@ -229,7 +382,7 @@ class Table:
         if condition is not None:
             rows = self.find_rows_by_condition(condition, btree_dic, hash_dic) # get the rows where condition is met
         else:
-            rows = [i for i in range(len(self.data))]
+            rows = list(range(len(self.data)))
 
         # copy the old dict, but only the rows and columns of data with index in rows/columns (the indexes that we want returned)
         dic = {(key):([[self.data[i][j] for j in return_cols] for i in rows] if key=="data" else value) for key,value in self.__dict__.items()}
@@ -561,7 +714,7 @@ class Table:
             union = set(left).union(set(right)) # get the union of left and right
             return list(union)
         elif 'not' in condition:
-            all_rows = [i for i in range(len(self.data))] # get all rows
+            all_rows = list(range(len(self.data))) # get all rows
             result = self.find_rows_by_condition(condition['not'], btree_dic, hash_dic)
             not_result = set(all_rows) - set(result) # get the difference of all rows and result
             return list(not_result)